@@ -0,0 +1,97 @@
+import numpy as np
+
+from vdw_surfgen.cli import (VDW_RADII, fibonacci_sphere, generate_surface, read_xyz_file,
+                             save_npy, save_txt, save_xyz)
+
+
+def write_xyz(path, atoms):
+    lines = [str(len(atoms)), "test molecule"]
+    lines += [f"{e} {x:.4f} {y:.4f} {z:.4f}" for e, (x, y, z) in atoms]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_read_xyz_file(tmp_path):
+    path = write_xyz(tmp_path / "water.xyz", [
+        ("O", (0.0, 0.0, 0.1173)),
+        ("H", (0.0, 0.7572, -0.4692)),
+        ("H", (0.0, -0.7572, -0.4692)),
+    ])
+    elements, coords = read_xyz_file(path)
+    assert elements == ["O", "H", "H"]
+    np.testing.assert_allclose(coords, [[0.0, 0.0, 0.1173],
+                                        [0.0, 0.7572, -0.4692],
+                                        [0.0, -0.7572, -0.4692]])
+
+
+def test_read_xyz_file_single_and_empty(tmp_path):
+    elements, coords = read_xyz_file(write_xyz(tmp_path / "he.xyz", [("He", (1.0, 2.0, 3.0))]))
+    assert elements == ["He"]
+    assert coords.shape == (1, 3)
+
+    elements, coords = read_xyz_file(write_xyz(tmp_path / "empty.xyz", []))
+    assert elements == []
+    assert coords.shape == (0, 3)
+    assert generate_surface(coords, elements).shape == (0, 3)
+
+
+def test_generate_surface_isolated_atom():
+    # A lone atom keeps its whole Fibonacci sphere: max(10, int(4*pi*r^2*density)) points
+    r = VDW_RADII['C']
+    surface = generate_surface(np.array([[1.0, -2.0, 3.0]]), ['C'], density=2.0)
+    n = int(4 * np.pi * r ** 2 * 2.0)
+    assert surface.shape == (n, 3)
+    np.testing.assert_allclose(surface, [1.0, -2.0, 3.0] + fibonacci_sphere(n) * r, atol=1e-6)
+
+
+def test_generate_surface_occlusion():
+    coords = np.array([[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [20.0, 0.0, 0.0]])
+    elements = ['C', 'O', 'Xx']
+    radii = np.array([VDW_RADII['C'], VDW_RADII['O'], 1.5])
+    surface = generate_surface(coords, elements)
+
+    dists = np.linalg.norm(surface[:, None, :] - coords[None], axis=2)
+    # Every point sits on its own atom's sphere and outside all the others
+    on_sphere = np.isclose(dists, radii, atol=1e-5)
+    assert on_sphere.sum(axis=1).tolist() == [1] * len(surface)
+    assert np.all(dists[~on_sphere] > np.broadcast_to(radii, dists.shape)[~on_sphere])
+    # The distant atom (unknown element, default radius) is untouched
+    assert on_sphere[:, 2].sum() == int(4 * np.pi * 1.5 ** 2)
+    # The overlapping pair lose their facing caps
+    assert on_sphere[:, 0].sum() < int(4 * np.pi * radii[0] ** 2)
+
+
+def test_generate_surface_coincident_atoms():
+    # Points exactly on a coincident neighbour's sphere survive only where rounding puts them
+    # strictly outside it; these counts match the original per-atom implementation
+    coords = np.zeros((2, 3))
+    assert len(generate_surface(coords, ['C', 'C'])) == 6
+    assert len(generate_surface(coords, ['N', 'N'])) == 10
+
+
+def test_surface_xyz_round_trip(tmp_path):
+    path = write_xyz(tmp_path / "co.xyz", [("C", (0.0, 0.0, 0.0)), ("O", (0.0, 0.0, 1.128))])
+    elements, coords = read_xyz_file(path)
+    surface = generate_surface(coords, elements, density=3.0)
+
+    out = tmp_path / "co_vdw_surface.xyz"
+    save_xyz(out, surface)
+    symbols, points = read_xyz_file(out)
+    assert symbols == ['H'] * len(surface)
+    np.testing.assert_allclose(points, surface, atol=1e-6)
+
+
+def test_surface_txt_and_npy_round_trip(tmp_path):
+    surface = generate_surface(np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1.128]]), ['C', 'O'],
+                               density=3.0)
+
+    txt = tmp_path / "co_vdw_surface.txt"
+    save_txt(txt, surface)
+    np.testing.assert_allclose(np.loadtxt(txt, ndmin=2), surface, atol=1e-6)
+
+    npy = tmp_path / "co_vdw_surface.npy"
+    save_npy(npy, surface)
+    points = np.load(npy)
+    assert points.dtype == np.float32
+    assert points.shape == (len(surface), 3)
+    np.testing.assert_allclose(points, surface, rtol=1e-6, atol=1e-6)
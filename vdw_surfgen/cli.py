@@ -1,11 +1,10 @@
 import argparse
 import numpy as np
 import os
+import functools
 from pathlib import Path
-import matplotlib.pyplot as plt
 from tqdm import tqdm
 from colorama import init, Fore, Style, Back
-import time
 
 # Initialize colorama for cross-platform colored terminal text
 init(autoreset=True)
@@ -19,23 +18,35 @@ VDW_RADII = {  # shortened for brevity
     'Pb': 2.02, 'U': 1.86
 }
 
+# Sorted array form of VDW_RADII for vectorized lookups via np.searchsorted
+_SORTED_SYMBOLS = np.array(sorted(VDW_RADII))
+_SORTED_RADII = np.array([VDW_RADII[s] for s in _SORTED_SYMBOLS])
+
+# Upper bound on surface points drawn by save_surface_figure
+MAX_PLOT_POINTS = 50000
+
+# Rows formatted per write in save_txt/save_xyz
+WRITE_CHUNK_ROWS = 100000
+
+
 def read_xyz_file(filepath):
     print(f"📂 {Fore.CYAN}Reading XYZ file: {filepath}{Style.RESET_ALL}")
     with open(filepath) as f:
-        lines = f.readlines()
-    natoms = int(lines[0])
-    atom_types = []
-    coords = []
-    
-    print(f"🔍 {Fore.YELLOW}Found {natoms} atoms{Style.RESET_ALL}")
-    for line in tqdm(lines[2:2 + natoms], desc="📍 Loading atoms", unit="atoms"):
-        parts = line.split()
-        atom_types.append(parts[0])
-        coords.append([float(x) for x in parts[1:4]])
-    return atom_types, np.array(coords)
-
+        natoms = int(f.readline())
 
-def fibonacci_sphere(samples):
+    print(f"🔍 {Fore.YELLOW}Found {natoms} atoms{Style.RESET_ALL}")
+    if natoms == 0:
+        return [], np.empty((0, 3))
+    # Vectorized parses skipping the count/comment lines: native float parser for coordinates,
+    # a separate string pass for the symbols
+    coords = np.loadtxt(filepath, skiprows=2, max_rows=natoms, usecols=(1, 2, 3),
+                        comments=None, ndmin=2)
+    atom_types = np.loadtxt(filepath, dtype=str, skiprows=2, max_rows=natoms, usecols=(0,),
+                            comments=None, ndmin=2)[:, 0].tolist()
+    return atom_types, coords
+
+
+def _fibonacci_sphere(samples):
     indices = np.arange(0, samples, dtype=float) + 0.5
     phi = np.arccos(1 - 2 * indices / samples)
     theta = np.pi * (1 + 5 ** 0.5) * indices
@@ -45,69 +56,97 @@ def fibonacci_sphere(samples):
     return np.stack((x, y, z), axis=1)
 
 
+@functools.lru_cache(maxsize=16)
+def fibonacci_sphere(samples):
+    # Cached per sample count; the returned array is shared, so it is made read-only
+    directions = _fibonacci_sphere(samples)
+    directions.flags.writeable = False
+    return directions
+
+
 def generate_surface(coordinates, elements, scale_factor=1.0, density=1.0):
     print(f"⚛️  {Fore.MAGENTA}Generating VDW surface points...{Style.RESET_ALL}")
-    surface_points = []
     n_atoms = len(elements)
-    coords_np = np.array(coordinates)
-    vdw_radii = np.array([VDW_RADII.get(e, 1.5) * scale_factor for e in elements])
-
-    for i, (pos, elem) in enumerate(tqdm(zip(coordinates, elements), desc="🌐 Building surface", unit="atoms", total=n_atoms)):
-        r = vdw_radii[i]
-        area = 4 * np.pi * r ** 2
-        n_points = max(10, int(area * density))
-        directions = fibonacci_sphere(n_points)
-        points = pos + directions * r
-
-        # Occlusion/collision detection and filtering
-        keep_mask = np.ones(points.shape[0], dtype=bool)
-        for j in range(n_atoms):
-            if j == i:
-                continue
-            other_pos = coords_np[j]
-            other_r = vdw_radii[j]
-            dists = np.linalg.norm(points - other_pos, axis=1)
-            keep_mask &= (dists > other_r)
-        filtered_points = points[keep_mask]
-        surface_points.append(filtered_points)
-        time.sleep(0.01)  # Small delay for visual effect
-
-    if surface_points:
-        result = np.concatenate(surface_points, axis=0)
-    else:
-        result = np.empty((0, 3))
+    coords_np = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+    # Look up each distinct element once, then broadcast back to atoms by index
+    unique_elems, elem_index = np.unique(np.asarray(elements, dtype=str), return_inverse=True)
+    idx = np.minimum(np.searchsorted(_SORTED_SYMBOLS, unique_elems), len(_SORTED_SYMBOLS) - 1)
+    known = _SORTED_SYMBOLS[idx] == unique_elems
+    unique_radii = np.where(known, _SORTED_RADII[idx], 1.5) * scale_factor
+    vdw_radii = unique_radii[elem_index.reshape(-1)]
+    n_points = np.maximum(10, (4 * np.pi * vdw_radii ** 2 * density).astype(int))
+
+    starts = np.cumsum(n_points) - n_points
+    # One sphere per distinct point count, shared by every atom with that count in both passes
+    spheres = {n: _fibonacci_sphere(n) for n in np.unique(n_points).tolist()}
+
+    # Occlusion/collision detection: only a keep flag per candidate point is stored
+    keep_mask = np.empty(int(n_points.sum()), dtype=bool)
+    for i in tqdm(range(n_atoms), desc="🌐 Building surface", unit="atoms"):
+        keep = keep_mask[starts[i]:starts[i] + n_points[i]]
+        keep[:] = True
+        # Only atoms whose spheres overlap atom i's sphere can hide any of its points
+        rel = coords_np - coords_np[i]
+        near = np.sum(rel ** 2, axis=1) <= (vdw_radii + vdw_radii[i]) ** 2
+        near[i] = False
+        points = coords_np[i] + spheres[int(n_points[i])] * vdw_radii[i]
+        for j in np.flatnonzero(near):
+            keep &= np.linalg.norm(points - coords_np[j], axis=1) > vdw_radii[j]
+
+    # Place the kept points straight into one exactly-sized output buffer
+    result = np.empty((int(keep_mask.sum()), 3))
+    n_kept = 0
+    for i in range(n_atoms):
+        directions = spheres[int(n_points[i])][keep_mask[starts[i]:starts[i] + n_points[i]]]
+        np.add(coords_np[i], directions * vdw_radii[i], out=result[n_kept:n_kept + len(directions)])
+        n_kept += len(directions)
+
     print(f"✨ {Fore.GREEN}Generated {len(result)} surface points!{Style.RESET_ALL}")
     return result
 
 
+def _write_points(f, coords, prefix=""):
+    # Format points with one %-operation per chunk: few large writes, bounded memory
+    coords = np.asarray(coords).reshape(-1, 3)
+    line = prefix.replace("%", "%%") + "%.6f %.6f %.6f\n"
+    for start in range(0, len(coords), WRITE_CHUNK_ROWS):
+        chunk = coords[start:start + WRITE_CHUNK_ROWS]
+        f.write((line * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
 def save_txt(filename, coords):
     print(f"💾 {Fore.BLUE}Saving TXT file: {filename}{Style.RESET_ALL}")
     with open(filename, 'w') as f:
-        for p in tqdm(coords, desc="💿 Writing TXT", unit="points"):
-            f.write(f"{p[0]:.6f} {p[1]:.6f} {p[2]:.6f}\n")
+        _write_points(f, coords)
 
 
 def save_xyz(filename, coords, atom='H'):
     print(f"💾 {Fore.BLUE}Saving XYZ file: {filename}{Style.RESET_ALL}")
     with open(filename, 'w') as f:
-        f.write(f"{len(coords)}\n")
-        f.write("VDW surface points\n")
-        for p in tqdm(coords, desc="🧬 Writing XYZ", unit="points"):
-            f.write(f"{atom} {p[0]:.6f} {p[1]:.6f} {p[2]:.6f}\n")
+        f.write(f"{len(coords)}\nVDW surface points\n")
+        _write_points(f, coords, prefix=f"{atom} ")
+
+
+def save_npy(filename, coords):
+    print(f"💾 {Fore.BLUE}Saving NPY file: {filename}{Style.RESET_ALL}")
+    np.save(filename, np.asarray(coords, dtype=np.float32))
 
 
 def save_surface_figure(coords, original_coords, output_path):
+    # Imported here so runs without --img don't pay matplotlib's import cost
+    import matplotlib.pyplot as plt
+
     print(f"🖼️  {Fore.CYAN}Creating 3D visualization: {output_path}{Style.RESET_ALL}")
     fig = plt.figure(figsize=(8, 6))
     ax = fig.add_subplot(projection='3d')
     
-    # Add progress for plotting
-    with tqdm(total=2, desc="📊 Plotting", unit="datasets") as pbar:
-        ax.scatter(coords[:, 0], coords[:, 1], coords[:, 2], s=1, alpha=0.5, label='VDW surface')
-        pbar.update(1)
-        ax.scatter(original_coords[:, 0], original_coords[:, 1], original_coords[:, 2],
-                   color='red', s=20, label='Atoms')
-        pbar.update(1)
+    # Dense surfaces are thinned for display; the saved point files are unaffected
+    stride = max(1, -(-len(coords) // MAX_PLOT_POINTS))
+    shown = coords[::stride]
+    ax.scatter(shown[:, 0], shown[:, 1], shown[:, 2], s=1, alpha=0.5, label='VDW surface',
+               rasterized=True)
+    ax.scatter(original_coords[:, 0], original_coords[:, 1], original_coords[:, 2],
+               color='red', s=20, label='Atoms')
     
     ax.set_xlabel('X')
     ax.set_ylabel('Y')
@@ -126,6 +165,7 @@ def main():
 {Fore.YELLOW}Examples:{Style.RESET_ALL}
   vsg molecule.xyz                    # Generate XYZ surface file only
   vsg molecule.xyz --txt              # Also save as TXT coordinates
+  vsg molecule.xyz --npy              # Also save as binary NumPy array
   vsg molecule.xyz --img              # Also save 3D visualization
   vsg molecule.xyz --txt --img        # Save all formats
   vsg molecule.xyz --scale 1.2 --density 2.0  # Custom parameters
@@ -140,6 +180,8 @@ def main():
                        help="🔬 Point density per Å² (default: 1.0)")
     parser.add_argument("--txt", action="store_true", 
                        help="💾 Save surface points as TXT file")
+    parser.add_argument("--npy", action="store_true", 
+                       help="📦 Save surface points as binary NPY file (float32)")
     parser.add_argument("--img", action="store_true", 
                        help="🖼️  Save 3D surface plot image")
 
@@ -172,6 +214,11 @@ def main():
         save_txt(txt_output, surface)
         saved_files.append(txt_output)
         
+    if args.npy:
+        npy_output = f"{name}_vdw_surface.npy"
+        save_npy(npy_output, surface)
+        saved_files.append(npy_output)
+        
     if args.img:
         img_output = f"{name}_vdw_surface.png"
         save_surface_figure(surface, coords, img_output)
@@ -184,7 +231,7 @@ def main():
 {Fore.CYAN}📂 Saved outputs:{Style.RESET_ALL}""")
     
     for i, file in enumerate(saved_files, 1):
-        file_emoji = "🧬" if file.endswith('.xyz') else "💿" if file.endswith('.txt') else "🖼️"
+        file_emoji = "🧬" if file.endswith('.xyz') else "💿" if file.endswith('.txt') else "📦" if file.endswith('.npy') else "🖼️"
         print(f"   {file_emoji} {Fore.WHITE}{file}{Style.RESET_ALL}")
     
     print(f"\n{Back.GREEN}{Fore.BLACK} ✅ VDW surface generation completed! ✅ {Style.RESET_ALL}\n")